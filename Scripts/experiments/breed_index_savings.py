@@ -0,0 +1,65 @@
+"""Requests saved by the breed alias index across all labels.csv breeds.
+
+Compares the naive `lower().replace(" ", "-")` slugs against the indexed
+per-source slugs. With --check, every URL is fetched to count real 404s.
+
+    python Scripts/experiments/breed_index_savings.py [--check]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from config import LABELS_PATH
+from tools.breed_index import BreedIndex
+from tools.paw_retriever_tool import PawRetrieverTool
+
+def fetch_ok(url, headers):
+    try:
+        return requests.get(url, headers=headers, timeout=10).status_code == 200
+    except requests.RequestException:
+        return False
+
+def main(check):
+    index = BreedIndex()
+    retriever = PawRetrieverTool()
+    breeds = sorted(pd.read_csv(LABELS_PATH)["breed"].unique())
+
+    naive_requests = indexed_requests = skipped = corrected = 0
+    naive_hits = indexed_hits = 0
+    for breed in breeds:
+        label = index.resolve(breed)
+        # The retriever agent is prompted to pass "Golden Retriever" style names
+        naive_slug = breed.replace("_", " ").lower().replace(" ", "-")
+        for source_name, base_url in retriever.sources.items():
+            slug = index.source_slug(label, source_name)
+            naive_requests += 1
+            if slug is None:
+                skipped += 1
+            else:
+                indexed_requests += 1
+                corrected += slug != naive_slug
+            if check:
+                naive_hits += fetch_ok(f"{base_url}{naive_slug}", retriever.headers)
+                if slug is not None:
+                    indexed_hits += fetch_ok(f"{base_url}{slug}", retriever.headers)
+
+    print(f"Breeds: {len(breeds)}")
+    print(f"Requests per full sweep: naive {naive_requests}, indexed {indexed_requests}")
+    print(f"Skipped without a request (known unavailable): {skipped}")
+    print(f"Slugs corrected from the naive form: {corrected}")
+    # Each request is followed by a 1 second politeness sleep in PawRetrieverTool
+    print(f"Sleep saved per full sweep: {skipped} s")
+    if check:
+        print(f"Pages found: naive {naive_hits}/{naive_requests}, indexed {indexed_hits}/{indexed_requests}")
+        print(f"Wasted requests: naive {naive_requests - naive_hits}, indexed {indexed_requests - indexed_hits}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="fetch every URL to count real 404s")
+    main(parser.parse_args().check)
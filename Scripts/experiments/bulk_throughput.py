@@ -0,0 +1,73 @@
+"""Throughput of bulk identification against the headless batch path.
+
+Compares one `predict_breed` call per image, `PawPredictorTool.predict_batch`
+and a background BulkJob (what the bulk upload UI runs) on the same images.
+
+    python Scripts/experiments/bulk_throughput.py --images-dir Data/train --count 256
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.bulk_jobs import BulkJob
+from config import PAW_DETECTOR_MODEL, LABELS_PATH, BULK_BATCH_SIZE
+from tools.paw_predictor_tool import PawPredictorTool
+
+def sample_images(images_dir, count):
+    if images_dir:
+        names = sorted(os.listdir(images_dir))[:count]
+        return [os.path.join(images_dir, name) for name in names]
+    rng = np.random.default_rng(42)
+    tmp_dir = tempfile.mkdtemp(prefix="paw_bulk_bench_")
+    paths = []
+    for i in range(count):
+        pixels = rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+        paths.append(os.path.join(tmp_dir, f"sample_{i}.jpg"))
+        Image.fromarray(pixels).save(paths[-1])
+    return paths
+
+def main(args):
+    tool = PawPredictorTool(args.model_path, LABELS_PATH)
+    img_paths = sample_images(args.images_dir, args.count)
+    tool.predict_batch(img_paths[:2])
+
+    start = time.perf_counter()
+    for img_path in img_paths:
+        tool._predict_breed(img_path, 0.7)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tool.predict_batch(img_paths, batch_size=args.batch_size)
+    batched = time.perf_counter() - start
+
+    files = []
+    for img_path in img_paths:
+        with open(img_path, "rb") as f:
+            files.append((os.path.basename(img_path), f.read()))
+    start = time.perf_counter()
+    job = BulkJob(tool, files, batch_size=args.batch_size).start()
+    while not job.done:
+        time.sleep(0.05)
+    bulk = time.perf_counter() - start
+
+    print(f"Images: {len(img_paths)}, batch size {args.batch_size}")
+    for name, elapsed in [("per-image predict", single), ("predict_batch", batched), ("BulkJob", bulk)]:
+        print(f"{name:<18} {len(img_paths) / elapsed:>8.1f} images/s")
+    print(f"BulkJob status: {job.status}, rows: {len(job.rows)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default=PAW_DETECTOR_MODEL)
+    parser.add_argument("--images-dir")
+    parser.add_argument("--count", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE)
+    main(parser.parse_args())
@@ -0,0 +1,180 @@
+"""Load test for single-flight coalescing of breed lookups and predictions.
+
+Fires N concurrent identical requests at the retriever tool (against a local
+mock AKC/DogTime server), the retriever agent (with a stub LLM executor) and,
+when a model is available, the predictor tool. Each scenario runs once without
+and once with coalescing and reports the upstream calls made.
+
+    python Scripts/experiments/coalescing_load_test.py --concurrency 20
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from agents.base_agent import PawAgent
+from agents.paw_retriever_agent import PawRetrieverAgent
+from config import PAW_DETECTOR_MODEL, LABELS_PATH
+from tools.breed_index import get_breed_index
+from tools.paw_retriever_tool import PawRetrieverTool
+from tools.single_flight import SingleFlight
+
+BREED = "golden_retriever"
+
+class MockSourceHandler(BaseHTTPRequestHandler):
+    hits = 0
+    delay = 0.2
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with MockSourceHandler.lock:
+            MockSourceHandler.hits += 1
+        time.sleep(MockSourceHandler.delay)
+        body = b"<html><div id='temperament'></div><p>Friendly and eager to please.</p></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubExecutor:
+    """Stands in for the Groq-backed AgentExecutor and counts LLM calls."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def invoke(self, inputs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"output": f"Final Answer: Summary for {inputs['input']}"}
+
+def run_concurrently(concurrency, fn, *args, per_call_args=None):
+    barrier = threading.Barrier(concurrency)
+    results = [None] * concurrency
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn(*(per_call_args[i] if per_call_args else args))
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+def report(name, concurrency, baseline_calls, baseline_time, coalesced_calls, coalesced_time):
+    print(f"{name:<22} {concurrency:>5} {baseline_calls:>15} {baseline_time:>10.2f}s "
+          f"{coalesced_calls:>16} {coalesced_time:>10.2f}s")
+
+def retriever_scenario(concurrency, port):
+    tool = PawRetrieverTool()
+    tool.sources = {source_name: f"http://127.0.0.1:{port}/{source_name}/" for source_name in tool.sources}
+
+    MockSourceHandler.hits = 0
+    _, baseline_time = run_concurrently(concurrency, lambda: tool._scrape(BREED, tool._source_slugs(BREED)))
+    baseline_hits = MockSourceHandler.hits
+
+    MockSourceHandler.hits = 0
+    results, coalesced_time = run_concurrently(concurrency, tool.scrape_breed_info, BREED)
+    assert all(result["success"] for result in results)
+    report("retriever (HTTP)", concurrency, baseline_hits, baseline_time, MockSourceHandler.hits, coalesced_time)
+
+def agent_scenario(concurrency, delay):
+    # Skip PawAgent.__init__, which needs a Groq key, and plug in the stub executor
+    agent = PawRetrieverAgent.__new__(PawRetrieverAgent)
+    agent.llm = type("StubLLM", (), {"model_name": "stub", "temperature": 0.0})()
+    agent.breed_index = get_breed_index()
+    query = f"Tell me about {BREED}"
+
+    agent.agent_executor = StubExecutor(delay)
+    _, baseline_time = run_concurrently(concurrency, lambda: PawAgent.run(agent, query))
+    baseline_calls = agent.agent_executor.calls
+
+    agent.agent_executor = StubExecutor(delay)
+    results, coalesced_time = run_concurrently(concurrency, agent.run, query)
+    assert len(set(results)) == 1
+    report("retriever agent (LLM)", concurrency, baseline_calls, baseline_time, agent.agent_executor.calls, coalesced_time)
+
+def predictor_scenario(concurrency, model_path):
+    from tools.paw_predictor_tool import PawPredictorTool
+
+    tool = PawPredictorTool(model_path, LABELS_PATH)
+    tmp_dir = tempfile.mkdtemp(prefix="paw_coalesce_")
+    source = os.path.join(tmp_dir, "upload.jpg")
+    Image.fromarray(np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)).save(source)
+    # Same content under different names, like the same photo uploaded from several sessions
+    paths = []
+    for i in range(concurrency):
+        paths.append(os.path.join(tmp_dir, f"upload_{i}.jpg"))
+        shutil.copy(source, paths[-1])
+    tool.predict_breed(source)
+
+    start_passes = tool.cascade_stats.summary()["requests"]
+    _, baseline_time = run_concurrently(concurrency, tool._predict_breed,
+                                        per_call_args=[(path, 0.7) for path in paths])
+    baseline_passes = tool.cascade_stats.summary()["requests"] - start_passes
+
+    start_passes = tool.cascade_stats.summary()["requests"]
+    results, coalesced_time = run_concurrently(concurrency, tool.predict_breed,
+                                            per_call_args=[(path,) for path in paths])
+    assert len({result["breed"] for result in results}) == 1
+    report("predictor (forward)", concurrency, baseline_passes, baseline_time,
+           tool.cascade_stats.summary()["requests"] - start_passes, coalesced_time)
+    shutil.rmtree(tmp_dir)
+
+def error_scenario(concurrency):
+    flight = SingleFlight(timeout=5)
+    calls = []
+
+    def failing_lookup():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ConnectionError("upstream unavailable")
+
+    results, elapsed = run_concurrently(concurrency, flight.do, "breed:dingo", failing_lookup)
+    errors = sum(isinstance(result, ConnectionError) for result in results)
+    print(f"\nError propagation: {len(calls)} upstream call, {errors}/{concurrency} callers received the ConnectionError")
+
+def main(args):
+    MockSourceHandler.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockSourceHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"{'scenario':<22} {'N':>5} {'calls (direct)':>15} {'time':>11} {'calls (coalesced)':>16} {'time':>11}")
+    retriever_scenario(args.concurrency, server.server_address[1])
+    agent_scenario(args.concurrency, args.delay)
+    if os.path.exists(args.model_path):
+        predictor_scenario(args.concurrency, args.model_path)
+    else:
+        print(f"predictor (forward)    skipped, no model at {args.model_path}")
+    error_scenario(args.concurrency)
+    server.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.2, help="mock upstream latency in seconds")
+    parser.add_argument("--model-path", default=PAW_DETECTOR_MODEL)
+    main(parser.parse_args())
@@ -0,0 +1,101 @@
+"""Soak test for chat session state.
+
+Simulates a long Streamlit session with hundreds of uploads and reports the
+per-session memory and the time of a real script rerun (streamlit.testing
+AppTest) for the legacy transcript (full resolution PIL images, unbounded,
+all rendered) against SessionStore (JPEG thumbnails, windowed render). Both
+transcripts are rendered by the same chat markup the interface uses.
+
+    python Scripts/experiments/session_soak.py --uploads 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from streamlit.testing.v1 import AppTest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.session_store import SessionStore
+
+def random_upload(rng, size):
+    pixels = rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8)
+    return Image.fromarray(pixels)
+
+def legacy_app():
+    import streamlit as st
+
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            if "image" in message:
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col2:
+                    st.image(message["image"], width=400)
+            st.markdown(message["content"])
+
+def store_app():
+    import streamlit as st
+    from config import MESSAGE_RENDER_WINDOW
+
+    store = st.session_state.session_store
+    hidden, visible_messages = store.window(MESSAGE_RENDER_WINDOW)
+    if hidden:
+        st.button(f"Show earlier messages ({hidden} hidden)")
+    for message in visible_messages:
+        with st.chat_message(message["role"]):
+            if "image" in message:
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col2:
+                    st.image(message["image"], width=400)
+            st.markdown(message["content"])
+
+def time_rerun(app, state_key, state, reruns):
+    """Average wall time of a rerun, after a first run that compiles the script."""
+    at = AppTest.from_function(app, default_timeout=600)
+    at.session_state[state_key] = state
+    at.run()
+    start = time.perf_counter()
+    for _ in range(reruns):
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return (time.perf_counter() - start) * 1000 / reruns
+
+def soak(uploads, image_size, report_every, reruns):
+    rng = np.random.default_rng(42)
+    legacy = []
+    store = SessionStore()
+
+    print(f"{'uploads':>8} {'legacy MB':>10} {'legacy rerun ms':>16} {'store MB':>9} {'store rerun ms':>15}")
+    for i in range(1, uploads + 1):
+        image = random_upload(rng, image_size)
+
+        legacy.append({"role": "user", "content": "What breed is this dog?", "image": image.copy()})
+        legacy.append({"role": "assistant", "content": "I've identified this cutie as a **Golden Retriever**!"})
+        store.add_message("user", "What breed is this dog?", image=image)
+        store.add_message("assistant", "I've identified this cutie as a **Golden Retriever**!")
+
+        if i % report_every == 0 or i == uploads:
+            legacy_mb = sum(m["image"].width * m["image"].height * 3 for m in legacy if "image" in m) / 1e6
+            store_mb = store.memory_bytes() / 1e6
+
+            legacy_ms = time_rerun(legacy_app, "messages", legacy, reruns)
+            store_ms = time_rerun(store_app, "session_store", store, reruns)
+
+            print(f"{i:>8} {legacy_mb:>10.1f} {legacy_ms:>16.1f} {store_mb:>9.2f} {store_ms:>15.2f}")
+
+    print(f"\nStore holds {len(store)} messages, {store.evicted_count} evicted")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=300)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=768)
+    parser.add_argument("--report-every", type=int, default=50)
+    parser.add_argument("--reruns", type=int, default=3)
+    args = parser.parse_args()
+    soak(args.uploads, (args.width, args.height), args.report_every, args.reruns)
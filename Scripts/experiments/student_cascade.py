@@ -0,0 +1,167 @@
+"""Student model for the confidence-gated prediction cascade.
+
+`train` distills the full MobileNetV2 model into a MobileNetV2 alpha 0.35 student
+at 160px and saves the class order it was trained on next to it. `evaluate` runs the cascade on the labels.csv holdout and reports the
+share of requests served by each stage with the resulting latency and accuracy.
+
+    python Scripts/experiments/student_cascade.py train --images-dir Data/train
+    python Scripts/experiments/student_cascade.py evaluate --images-dir Data/train --margin 0.8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from tensorflow.keras.applications import MobileNetV2
+from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+from tensorflow.keras.layers import Dense, GlobalAveragePooling2D
+from tensorflow.keras.models import Model
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from config import PAW_DETECTOR_MODEL, PAW_STUDENT_MODEL, PAW_STUDENT_CLASS_INDICES, LABELS_PATH, CASCADE_MARGIN
+from tools.paw_predictor_tool import PawPredictorTool
+
+IMG_SIZE = 224
+STUDENT_IMG_SIZE = 160
+BATCH_SIZE = 32
+HOLDOUT_SPLIT = 0.2
+
+def create_model(input_shape=(224, 224, 3), output_shape=120, alpha=1.0):
+    # Same architecture as the notebook's create_model, with a width multiplier
+    base_model = MobileNetV2(input_shape=input_shape,
+                             include_top=False,
+                             alpha=alpha,
+                             weights='imagenet')
+    base_model.trainable = False
+
+    x = base_model.output
+    x = GlobalAveragePooling2D()(x)
+    x = tf.keras.layers.Dropout(0.2)(x)
+    outputs = Dense(output_shape, activation='softmax')(x)
+    return Model(inputs=base_model.input, outputs=outputs)
+
+def split_labels(labels_path):
+    """Returns (train, holdout) frames; the holdout is the first 20% of labels.csv,
+    matching the validation subset of Scripts/experiments/predictorpipeline.py."""
+    labels = pd.read_csv(labels_path)
+    split = int(len(labels) * HOLDOUT_SPLIT)
+    return labels.iloc[split:], labels.iloc[:split]
+
+def create_distillation_batches(labels, images_dir, class_indices):
+    filenames = [os.path.join(images_dir, f"{fname}.jpg") for fname in labels["id"]]
+    targets = [class_indices[breed] for breed in labels["breed"]]
+
+    def process_image(image_path, label):
+        image = tf.io.read_file(image_path)
+        image = tf.image.decode_jpeg(image, channels=3)
+        image = tf.image.resize(image, size=[IMG_SIZE, IMG_SIZE])
+        image = tf.image.random_flip_left_right(image)
+        return preprocess_input(image), tf.one_hot(label, len(class_indices))
+
+    data = tf.data.Dataset.from_tensor_slices((tf.constant(filenames), tf.constant(targets)))
+    data = data.shuffle(buffer_size=len(filenames))
+    data = data.map(process_image, num_parallel_calls=tf.data.AUTOTUNE)
+    return data.batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE)
+
+def train(args):
+    train_labels, _ = split_labels(args.labels_path)
+    # Same class order as PawPredictorTool, built from every label
+    all_breeds = pd.read_csv(args.labels_path)["breed"].unique()
+    class_indices = {breed: i for i, breed in enumerate(sorted(all_breeds))}
+    train_data = create_distillation_batches(train_labels, args.images_dir, class_indices)
+
+    teacher = tf.keras.models.load_model(args.teacher)
+    teacher.trainable = False
+    student = create_model(input_shape=(STUDENT_IMG_SIZE, STUDENT_IMG_SIZE, 3),
+                           output_shape=len(class_indices), alpha=args.alpha)
+    optimizer = tf.keras.optimizers.Adam(learning_rate=0.001)
+    kl_divergence = tf.keras.losses.KLDivergence()
+    cross_entropy = tf.keras.losses.CategoricalCrossentropy()
+
+    # Both models end in softmax, so softmax(log(p) / T) is the tempered distribution
+    def soften(probs):
+        return tf.nn.softmax(tf.math.log(probs + 1e-8) / args.temperature)
+
+    @tf.function
+    def train_step(images, labels):
+        teacher_probs = teacher(images, training=False)
+        student_images = tf.image.resize(images, size=[STUDENT_IMG_SIZE, STUDENT_IMG_SIZE])
+        with tf.GradientTape() as tape:
+            student_probs = student(student_images, training=True)
+            hard_loss = cross_entropy(labels, student_probs)
+            soft_loss = kl_divergence(soften(teacher_probs), soften(student_probs)) * args.temperature ** 2
+            loss = args.hard_weight * hard_loss + (1 - args.hard_weight) * soft_loss
+        gradients = tape.gradient(loss, student.trainable_variables)
+        optimizer.apply_gradients(zip(gradients, student.trainable_variables))
+        return loss
+
+    for epoch in range(1, args.epochs + 1):
+        losses = [float(train_step(images, labels)) for images, labels in train_data]
+        print(f"Epoch {epoch}/{args.epochs} - distillation loss: {np.mean(losses):.4f}")
+
+    student.save(args.output)
+    # The cascade maps student outputs with this, whatever model it ends up paired with
+    with open(args.class_indices_output, "w") as f:
+        json.dump(class_indices, f, indent=2)
+    print(f"Student saved to {args.output}, class indices to {args.class_indices_output}")
+
+def evaluate(args):
+    _, holdout = split_labels(args.labels_path)
+    if args.limit:
+        holdout = holdout.iloc[:args.limit]
+    image_paths = [os.path.join(args.images_dir, f"{fname}.jpg") for fname in holdout["id"]]
+
+    runs = [
+        ("full model", PawPredictorTool(args.teacher, args.labels_path)),
+        ("cascade", PawPredictorTool(args.teacher, args.labels_path,
+                                     student_model_path=args.student, cascade_margin=args.margin,
+                                     student_class_indices_path=args.student_class_indices))
+    ]
+    if runs[1][1].student is None:
+        raise FileNotFoundError(f"Student model or class indices not found at {args.student}")
+
+    for name, tool in runs:
+        correct = 0
+        start = time.perf_counter()
+        for img_path, breed in zip(image_paths, holdout["breed"]):
+            correct += tool.predict_breed(img_path).get("breed") == breed
+        elapsed = time.perf_counter() - start
+        stats = tool.cascade_stats.summary()
+        print(f"{name}: accuracy {correct / len(image_paths):.2%}, "
+              f"avg latency {elapsed / len(image_paths) * 1000:.1f} ms, "
+              f"student {stats['student_share']:.1%} / full {stats['full_share']:.1%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train")
+    train_parser.add_argument("--alpha", type=float, default=0.35)
+    train_parser.add_argument("--epochs", type=int, default=10)
+    train_parser.add_argument("--temperature", type=float, default=4.0)
+    train_parser.add_argument("--hard-weight", type=float, default=0.3)
+    train_parser.add_argument("--output", default=PAW_STUDENT_MODEL)
+    train_parser.add_argument("--class-indices-output", default=PAW_STUDENT_CLASS_INDICES)
+    train_parser.set_defaults(func=train)
+
+    evaluate_parser = subparsers.add_parser("evaluate")
+    evaluate_parser.add_argument("--student", default=PAW_STUDENT_MODEL)
+    evaluate_parser.add_argument("--student-class-indices", default=PAW_STUDENT_CLASS_INDICES)
+    evaluate_parser.add_argument("--margin", type=float, default=CASCADE_MARGIN)
+    evaluate_parser.add_argument("--limit", type=int, default=0)
+    evaluate_parser.set_defaults(func=evaluate)
+
+    for subparser in (train_parser, evaluate_parser):
+        subparser.add_argument("--images-dir", default="Data/train")
+        subparser.add_argument("--labels-path", default=LABELS_PATH)
+        subparser.add_argument("--teacher", default=PAW_DETECTOR_MODEL)
+
+    args = parser.parse_args()
+    args.func(args)
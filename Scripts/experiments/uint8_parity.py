@@ -0,0 +1,124 @@
+"""Parity and savings check for the uint8 in-graph preprocessing export.
+
+Runs the original float pipeline (img_to_array + preprocess_input in NumPy)
+and the uint8 export on the same images, fails if their predictions diverge,
+and reports host-side allocation, input bytes and latency for both.
+
+A second case feeds the export native-size uint8 images, so its in-graph
+Resizing layer does the resize. That resize is bilinear while the host path
+resizes with PIL nearest, so this case is checked against a looser
+tolerance and a minimum top-1 agreement.
+
+    python Scripts/experiments/uint8_parity.py --images-dir Data/train --count 200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from config import PAW_DETECTOR_MODEL
+from tools.paw_predictor_tool import model_input_spec, load_image
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from export_uint8_model import wrap_uint8
+
+def sample_images(images_dir, count):
+    if images_dir:
+        names = sorted(os.listdir(images_dir))[:count]
+        return [os.path.join(images_dir, name) for name in names]
+    # Synthetic JPEGs of varying size when no dataset is at hand
+    rng = np.random.default_rng(42)
+    tmp_dir = tempfile.mkdtemp(prefix="paw_parity_")
+    paths = []
+    for i in range(count):
+        height, width = rng.integers(200, 800, size=2)
+        # Upscaled coarse noise is smooth like a photo, so the resize method matters as little as it would
+        pixels = rng.integers(0, 256, size=(height // 16, width // 16, 3), dtype=np.uint8)
+        path = os.path.join(tmp_dir, f"sample_{i}.jpg")
+        Image.fromarray(pixels).resize((width, height), Image.BICUBIC).save(path)
+        paths.append(path)
+    return paths
+
+def measure(model, img_paths, img_size, uint8_input):
+    preds, peak_bytes, input_bytes, latency = [], 0, 0, 0.0
+    for img_path in img_paths:
+        tracemalloc.start()
+        start = time.perf_counter()
+        img_array = load_image(img_path, img_size, uint8_input)
+        peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        preds.append(model.predict(img_array, verbose=0)[0])
+        latency += time.perf_counter() - start
+        input_bytes = img_array.nbytes
+    return np.array(preds), peak_bytes, input_bytes, latency / len(img_paths)
+
+def predict_native(uint8_model, img_paths):
+    preds = []
+    for img_path in img_paths:
+        with Image.open(img_path) as img:
+            img_array = np.expand_dims(np.asarray(img.convert("RGB"), dtype=np.uint8), axis=0)
+        # Called directly rather than via predict, which would retrace for every input size
+        preds.append(np.asarray(uint8_model(img_array, training=False))[0])
+    return np.array(preds)
+
+def compare(reference, preds):
+    max_diff = float(np.abs(reference - preds).max())
+    top1_agreement = float(np.mean(reference.argmax(axis=1) == preds.argmax(axis=1)))
+    return max_diff, top1_agreement
+
+def main(args):
+    classifier = tf.keras.models.load_model(args.model_path)
+    uint8_model = tf.keras.models.load_model(args.uint8_model_path) if args.uint8_model_path else wrap_uint8(classifier)
+    img_size, _ = model_input_spec(classifier)
+    img_paths = sample_images(args.images_dir, args.count)
+
+    # Warm both graphs so tracing doesn't count as latency
+    classifier.predict(np.zeros((1, *img_size, 3), dtype=np.float32), verbose=0)
+    uint8_model.predict(np.zeros((1, *img_size, 3), dtype=np.uint8), verbose=0)
+
+    float_preds, float_peak, float_bytes, float_latency = measure(classifier, img_paths, img_size, False)
+    uint8_preds, uint8_peak, uint8_bytes, uint8_latency = measure(uint8_model, img_paths, img_size, True)
+
+    native_preds = predict_native(uint8_model, img_paths)
+
+    max_diff, top1_agreement = compare(float_preds, uint8_preds)
+    native_diff, native_agreement = compare(float_preds, native_preds)
+
+    print(f"Images: {len(img_paths)}")
+    print(f"Host-resized uint8: max probability difference {max_diff:.2e}, top-1 agreement {top1_agreement:.2%}")
+    print(f"Native-size uint8 (in-graph resize): max probability difference {native_diff:.2e}, "
+          f"top-1 agreement {native_agreement:.2%}")
+    print(f"Peak host preprocessing allocation: float {float_peak / 1e6:.2f} MB, uint8 {uint8_peak / 1e6:.2f} MB")
+    print(f"Model input per image: float {float_bytes / 1e3:.0f} KB, uint8 {uint8_bytes / 1e3:.0f} KB")
+    print(f"Average latency: float {float_latency * 1000:.1f} ms, uint8 {uint8_latency * 1000:.1f} ms")
+
+    if max_diff > args.tolerance or top1_agreement < 1.0:
+        sys.exit(f"Parity check failed (tolerance {args.tolerance})")
+    if native_diff > args.native_tolerance or native_agreement < args.min_native_agreement:
+        sys.exit(f"Native-size parity check failed (tolerance {args.native_tolerance}, "
+                 f"minimum top-1 agreement {args.min_native_agreement:.0%})")
+    print("Parity check passed")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default=PAW_DETECTOR_MODEL)
+    parser.add_argument("--uint8-model-path", help="exported model; wraps --model-path in memory if omitted")
+    parser.add_argument("--images-dir")
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    parser.add_argument("--native-tolerance", type=float, default=0.1,
+                        help="max probability difference for native-size inputs")
+    parser.add_argument("--min-native-agreement", type=float, default=0.95,
+                        help="minimum top-1 agreement for native-size inputs")
+    main(parser.parse_args())
@@ -0,0 +1,67 @@
+"""Export a classifier that takes raw uint8 HWC batches.
+
+Wraps the trained model with Resizing and Rescaling layers so resize and
+normalization run in the graph. PawPredictorTool detects the uint8 input and
+skips the NumPy float conversion; --tflite writes the same contract for
+TFLite runtimes.
+
+`mobilenet` normalization (to [-1, 1]) matches mobilenet_v2.preprocess_input,
+which the app has always used at inference. Use `unit` (to [0, 1]) for models
+trained with the notebook's convert_image_dtype pipeline.
+
+    python Scripts/export_uint8_model.py "Models/Paw Detector Final Model.keras" \
+        "Models/Paw Detector Final Model uint8.keras" --tflite
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import tensorflow as tf
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tools.paw_predictor_tool import model_input_spec
+
+NORMALIZATION = {
+    "mobilenet": {"scale": 1 / 127.5, "offset": -1.0},
+    "unit": {"scale": 1 / 255.0, "offset": 0.0}
+}
+
+def wrap_uint8(classifier, normalization="mobilenet"):
+    img_size, uint8_input = model_input_spec(classifier)
+    if uint8_input:
+        raise ValueError("Model already takes uint8 input")
+
+    inputs = tf.keras.Input(shape=(None, None, 3), dtype="uint8", name="image")
+    x = tf.keras.layers.Resizing(*img_size, name="resize")(inputs)
+    x = tf.keras.layers.Rescaling(**NORMALIZATION[normalization], name="normalize")(x)
+    outputs = classifier(x)
+    return tf.keras.Model(inputs=inputs, outputs=outputs, name=f"{classifier.name}_uint8")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("model_path")
+    parser.add_argument("output_path")
+    parser.add_argument("--normalization", choices=sorted(NORMALIZATION), default="mobilenet")
+    parser.add_argument("--tflite", action="store_true", help="also write a .tflite next to the output")
+    args = parser.parse_args()
+
+    classifier = tf.keras.models.load_model(args.model_path)
+    model = wrap_uint8(classifier, args.normalization)
+    model.save(args.output_path)
+    print(f"Saved uint8 model to {args.output_path}")
+
+    if args.tflite:
+        # TFLite needs static spatial dims, so the exported graph is fixed to the classifier's size
+        img_size, _ = model_input_spec(classifier)
+        run = tf.function(lambda image: model(image)).get_concrete_function(
+            tf.TensorSpec([1, *img_size, 3], tf.uint8))
+        converter = tf.lite.TFLiteConverter.from_concrete_functions([run], model)
+        tflite_path = str(Path(args.output_path).with_suffix(".tflite"))
+        with open(tflite_path, "wb") as f:
+            f.write(converter.convert())
+        print(f"Saved TFLite model to {tflite_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Manage the versioned model registry.
+
+Running workers poll the registry's ACTIVE file and hot swap to the new
+version after warming it up, so `activate` rolls out without restarts.
+
+    python Scripts/model_registry.py list
+    python Scripts/model_registry.py publish v2 "Models/Paw Detector Final Model.keras" \
+        --student "Models/Paw Detector Student Model.keras" \
+        --student-class-indices "Models/Paw Detector Student Model class_indices.json"
+    python Scripts/model_registry.py activate v2
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from config import LABELS_PATH, MODEL_REGISTRY_DIR
+from tools.model_registry import ModelRegistry
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registry-dir", default=MODEL_REGISTRY_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list")
+
+    publish_parser = subparsers.add_parser("publish")
+    publish_parser.add_argument("version")
+    publish_parser.add_argument("model_path")
+    publish_parser.add_argument("--labels-path", default=LABELS_PATH)
+    publish_parser.add_argument("--student", help="student distilled from this model, served by the cascade")
+    publish_parser.add_argument("--student-class-indices", help="class_indices.json written with the student")
+
+    activate_parser = subparsers.add_parser("activate")
+    activate_parser.add_argument("version")
+
+    args = parser.parse_args()
+    registry = ModelRegistry(args.registry_dir)
+
+    if args.command == "list":
+        active = registry.active.version if registry.active else None
+        for version in registry.list_versions():
+            print(f"{'*' if version == active else ' '} {version}")
+    elif args.command == "publish":
+        unique_breeds = pd.read_csv(args.labels_path)["breed"].unique()
+        class_indices = {breed: i for i, breed in enumerate(sorted(unique_breeds))}
+        student_class_indices = None
+        if args.student:
+            if not args.student_class_indices:
+                parser.error("--student needs --student-class-indices")
+            with open(args.student_class_indices) as f:
+                student_class_indices = json.load(f)
+        version_dir = registry.publish(args.version, args.model_path, class_indices,
+                                       student_path=args.student, student_class_indices=student_class_indices)
+        print(f"Published {version_dir}")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"Activated {args.version}")
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,22 @@ from langchain.agents import Tool
 import os
 from .base_agent import PawAgent
 from tools.paw_predictor_tool import PawPredictorTool
+from tools.model_registry import get_registry
 from prompts import get_predictor_prompt
-from config import PAW_DETECTOR_MODEL, LABELS_PATH
+from config import PAW_DETECTOR_MODEL, PAW_STUDENT_MODEL, PAW_STUDENT_CLASS_INDICES, LABELS_PATH
 
 class PawPredictorAgent(PawAgent):
     def __init__(self, api_key=None, model_name=None, temperature=None,
-                 model_path=None, labels_path=None):
+                 model_path=None, labels_path=None, student_model_path=None):
         super().__init__(api_key=api_key, model_name=model_name, temperature=temperature)
         self.model_path = model_path or PAW_DETECTOR_MODEL
         self.labels_path = labels_path or LABELS_PATH
+        self.student_model_path = student_model_path or PAW_STUDENT_MODEL
 
-        self.predictor_tool = PawPredictorTool(self.model_path, self.labels_path)
+        self.predictor_tool = PawPredictorTool(self.model_path, self.labels_path,
+                                               student_model_path=self.student_model_path,
+                                               student_class_indices_path=PAW_STUDENT_CLASS_INDICES,
+                                               registry=get_registry())
         
         self.tools = [
             Tool(
@@ -1,8 +1,13 @@
 from langchain.agents import Tool
+from concurrent.futures import TimeoutError
 from .base_agent import PawAgent
 from tools.paw_retriever_tool import PawRetrieverTool
+from tools.breed_index import get_breed_index
+from tools.single_flight import SingleFlight
 from prompts import get_retriever_prompt
 
+_summary_flight = SingleFlight()
+
 class PawRetrieverAgent(PawAgent):
     def __init__(self, api_key=None, model_name=None, temperature=None):
         super().__init__(api_key=api_key, model_name=model_name, temperature=temperature)
@@ -17,6 +22,15 @@ class PawRetrieverAgent(PawAgent):
         ]
         prompt = get_retriever_prompt()
         self.agent_executor = self._create_agent(self.tools, prompt)
+        self.breed_index = get_breed_index()
+    
+    def run(self, query: str) -> str:
+        # Same question about the same breed, however the breed was spelled
+        key = f"{self.llm.model_name}|{self.llm.temperature}|{self.breed_index.canonical_text(query)}"
+        try:
+            return _summary_flight.do(key, super().run, query)
+        except TimeoutError as e:
+            return f"Error during execution: {str(e)}"
     
     def _retrieve_breed_info(self, breed_name: str) -> str:
         if not breed_name or len(breed_name) < 2:
@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
+import pandas as pd
+from tools.breed_index import get_breed_index
+from config import BULK_BATCH_SIZE, BULK_MAX_WORKERS
+
+# Runs outside the Streamlit script thread, so reruns never block on inference
+_bulk_executor = ThreadPoolExecutor(max_workers=BULK_MAX_WORKERS, thread_name_prefix="paw-bulk")
+
+RESULT_COLUMNS = ["File", "Breed", "Confidence (%)", "Alternatives", "Error"]
+
+class BulkJob:
+    """Batched breed identification for many uploads, run on a background thread.
+
+    Progress and result rows are updated after every batch, so the UI can poll
+    them while the job runs.
+    """
+
+    def __init__(self, predictor_tool, files: List[Tuple[str, bytes]], batch_size=BULK_BATCH_SIZE):
+        self.id = uuid.uuid4().hex[:8]
+        self.predictor_tool = predictor_tool
+        self.batch_size = batch_size
+        self.total = len(files)
+        self.completed = 0
+        self.rows: List[Dict[str, Any]] = []
+        self.status = "queued"
+        self.error = None
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+        # Copy the uploads to disk now; Streamlit's file buffers don't outlive the rerun
+        self.work_dir = tempfile.mkdtemp(prefix=f"paw_bulk_{self.id}_")
+        self.files = []
+        for i, (name, data) in enumerate(files):
+            path = os.path.join(self.work_dir, f"{i:05d}_{os.path.basename(name)}")
+            with open(path, "wb") as f:
+                f.write(data)
+            self.files.append((name, path))
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("finished", "failed", "cancelled")
+
+    def start(self) -> "BulkJob":
+        _bulk_executor.submit(self._run)
+        return self
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def _run(self) -> None:
+        self.status = "running"
+        breed_index = get_breed_index()
+        try:
+            for start in range(0, self.total, self.batch_size):
+                if self._cancelled.is_set():
+                    self.status = "cancelled"
+                    return
+                batch = self.files[start:start + self.batch_size]
+                results = self.predictor_tool.predict_batch([path for _, path in batch], batch_size=self.batch_size)
+                rows = [self._to_row(name, result, breed_index) for (name, _), result in zip(batch, results)]
+                with self._lock:
+                    self.rows.extend(rows)
+                    self.completed += len(batch)
+            self.status = "finished"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _to_row(self, name: str, result: Dict[str, Any], breed_index) -> Dict[str, Any]:
+        if "error" in result:
+            return {"File": name, "Breed": None, "Confidence (%)": None, "Alternatives": "", "Error": result["error"]}
+        alternatives = ", ".join(
+            f"{breed_index.display_name(alt['breed'])} ({alt['confidence']:.2%})" for alt in result["alternatives"]
+        )
+        return {
+            "File": name,
+            "Breed": breed_index.display_name(result["breed"]),
+            "Confidence (%)": round(result["confidence"] * 100, 2),
+            "Alternatives": alternatives,
+            "Error": ""
+        }
+
+    def results_frame(self) -> pd.DataFrame:
+        with self._lock:
+            return pd.DataFrame(list(self.rows), columns=RESULT_COLUMNS)
+
+    def to_csv(self) -> bytes:
+        return self.results_frame().to_csv(index=False).encode("utf-8")
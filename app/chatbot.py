@@ -1,15 +1,21 @@
 import os
 import re
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError
 from typing import Dict, Any, List, Optional, Tuple
 from agents.paw_predictor_agent import PawPredictorAgent
 from agents.paw_retriever_agent import PawRetrieverAgent
-from config import PAW_DETECTOR_MODEL, LABELS_PATH
+from tools.breed_index import get_breed_index
+from config import PAW_DETECTOR_MODEL, LABELS_PATH, MAX_CHAT_HISTORY, PREFETCH_MAX_WORKERS, PREFETCH_WAIT_SECONDS
+
+# Shared by all sessions so prefetching can't exceed the per-process cap
+_prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="paw-prefetch")
 
 class DogBreedChatbot:
     def __init__(self, api_key=None, model_name=None, temperature=None,
-                 model_path=None, labels_path=None):
+                 model_path=None, labels_path=None, max_history=None):
         self.api_key = api_key
+        self.max_history = max_history or MAX_CHAT_HISTORY
         
         self.predictor_agent = PawPredictorAgent(
             api_key=self.api_key,
@@ -24,29 +30,49 @@ class DogBreedChatbot:
             model_name=model_name,
             temperature=temperature
         )
+        self.breed_index = get_breed_index()
         
         self.context = {
             "current_breed": None,
+            "predicted_breeds": [],
             "current_image": None,
-            "history": []
+            "history": [],
+            "evicted_history": 0,
+            "prefetch": {}
         }
     
     def process_message(self, message: str, image_path: Optional[str] = None) -> str:
-        self.context["history"].append({"role": "user", "content": message})
+        self._append_history("user", message)
         try:
             if image_path and os.path.exists(image_path):
+                self._cancel_prefetch()
                 self.context["current_image"] = image_path
                 return self._process_image(image_path, message)
-            if self.context["current_breed"] and self._is_breed_inquiry(message):
-                formatted_breed = self._format_breed_name(self.context["current_breed"])
-                return self._get_breed_info(formatted_breed)
+            if self._is_breed_inquiry(message):
+                # "poodle" means the poodle we identified, not whichever variant is listed first
+                preferred = [self.context["current_breed"], *self.context["predicted_breeds"]]
+                if mentioned_breed := self.breed_index.find_in_text(message, preferred):
+                    self.context["current_breed"] = mentioned_breed
+                if self.context["current_breed"]:
+                    formatted_breed = self._format_breed_name(self.context["current_breed"])
+                    return self._get_breed_info(formatted_breed)
             if self._is_help_request(message):
                 return self._get_help_message()
             return self._get_default_response()
         except Exception as e:
             return f"Sorry, I encountered an error: {str(e)}"
     
+    def _append_history(self, role: str, content: str) -> None:
+        history = self.context["history"]
+        history.append({"role": role, "content": content})
+        overflow = len(history) - self.max_history
+        if overflow > 0:
+            del history[:overflow]
+            self.context["evicted_history"] += overflow
+
     def _format_breed_name(self, breed_name: str) -> str:
+        if label := self.breed_index.resolve(breed_name):
+            return self.breed_index.display_name(label)
         return " ".join(word.capitalize() for word in breed_name.split("_"))
 
     def _process_image(self, image_path: str, message: str) -> str:
@@ -62,6 +88,8 @@ class DogBreedChatbot:
         
         if breed_name:
             self.context["current_breed"] = breed_name
+            self.context["predicted_breeds"] = [breed_name] + [alt_breed for alt_breed, _ in alternatives]
+            self._start_prefetch(self.context["predicted_breeds"])
             formatted_breed = self._format_breed_name(breed_name)
             response = f"🐾 Breed Identification Results\n\n"
             response += f"I've identified this cutie as a **{formatted_breed}**{confidence_str}!\n\n"
@@ -108,9 +136,43 @@ class DogBreedChatbot:
             return f" ({confidence:.2f}%)"
         return ""
     
+    def _prefetch_key(self, breed_name: str) -> str:
+        return self.breed_index.resolve(breed_name) or breed_name.lower().replace(" ", "_")
+
+    def _start_prefetch(self, breed_names: List[str]) -> None:
+        for breed_name in breed_names:
+            key = self._prefetch_key(breed_name)
+            if key not in self.context["prefetch"]:
+                formatted_breed = self._format_breed_name(breed_name)
+                self.context["prefetch"][key] = _prefetch_executor.submit(self._fetch_breed_info, formatted_breed)
+
+    def _cancel_prefetch(self) -> None:
+        # Queued lookups are dropped; running ones finish but their results are discarded
+        for future in self.context["prefetch"].values():
+            future.cancel()
+        self.context["prefetch"] = {}
+
     def _get_breed_info(self, breed_name: str) -> str:
+        key = self._prefetch_key(breed_name)
+        future: Optional[Future] = self.context["prefetch"].get(key)
+        # A prefetch still queued behind other sessions' lookups is dropped, asking now is faster
+        if future is not None and not future.cancel():
+            try:
+                return future.result(timeout=PREFETCH_WAIT_SECONDS)
+            except TimeoutError:
+                pass
+            except Exception:
+                # Don't replay a failed lookup to later questions; they retry like without prefetch
+                self.context["prefetch"].pop(key, None)
+        # Joins the prefetch's summary call if it is still in flight, see PawRetrieverAgent.run
+        return self._fetch_breed_info(breed_name)
+
+    def _fetch_breed_info(self, breed_name: str) -> str:
         api_breed_name = breed_name.lower().replace(" ", "_")
         breed_info = self.retriever_agent.run(f"Tell me about {api_breed_name}")
+        # PawAgent.run reports failures as text; raise so they aren't kept as a prefetched answer
+        if breed_info.startswith("Error during execution"):
+            raise RuntimeError(breed_info)
         final_answer_match = re.search(r"Final Answer:(.*?)$", breed_info, re.DOTALL)
         if final_answer_match:
             breed_info = final_answer_match.group(1).strip()
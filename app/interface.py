@@ -10,7 +10,9 @@ parent_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(parent_dir))
 
 from app.chatbot import DogBreedChatbot
-from config import PAW_DETECTOR_MODEL, LABELS_PATH
+from app.session_store import SessionStore
+from app.bulk_jobs import BulkJob
+from config import PAW_DETECTOR_MODEL, LABELS_PATH, MESSAGE_RENDER_WINDOW, BULK_REFRESH_SECONDS
 
 TEMP_DIR = tempfile.gettempdir()
 
@@ -41,8 +43,10 @@ def initialize_app():
         </style>
     """, unsafe_allow_html=True)
     
-    if "messages" not in st.session_state:
-        st.session_state.messages = []   
+    if "session_store" not in st.session_state:
+        st.session_state.session_store = SessionStore()
+    if "render_window" not in st.session_state:
+        st.session_state.render_window = MESSAGE_RENDER_WINDOW
     if "chatbot" not in st.session_state:
         initialize_chatbot()
     
@@ -73,25 +77,23 @@ def create_sidebar():
             2. Click **Identify Breed** to analyze the image
             3. **Ask questions** about the identified breed
             4. Upload a **new image** anytime to identify another breed
+            5. Switch on **Bulk upload** to identify many photos at once and download the results as CSV
             
             ### About Paw Detector
             Paw Detector uses a specialized deep learning model named MobileNetV2 to identify dog breeds and provides detailed information about each breed's characteristics, temperament, care requirements, and more!
             """)
 
 def process_image(image, image_path):
-    st.session_state.messages.append({
-        "role": "user",
-        "content": "What breed is this dog?",
-        "image": image
-    })
+    store = st.session_state.session_store
+    store.add_message("user", "What breed is this dog?", image=image)
     
     with st.spinner("Identifying the curious paw..."):
         try:
             response = st.session_state.chatbot.process_message("What breed is this dog?", image_path)
-            st.session_state.messages.append({"role": "assistant", "content": response})
+            store.add_message("assistant", response)
         except Exception as e:
             error_msg = f"Error processing image: {str(e)}"
-            st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            store.add_message("assistant", error_msg)
     
     st.rerun()
 
@@ -107,20 +109,34 @@ def create_chat_interface():
     with upload_container:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            uploaded_file = st.file_uploader("Upload", type=["jpg", "jpeg", "png"], label_visibility="collapsed")
-            if uploaded_file is not None:
-                image = Image.open(uploaded_file)
-                timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
-                image_path = os.path.join(TEMP_DIR, f"dog_image_{timestamp}.jpg")
-                image.save(image_path)
-                if st.button("Identify Breed", key="identify_button", use_container_width=True):
-                    process_image(image, image_path)
+            bulk_mode = st.toggle("Bulk upload", key="bulk_mode")
+            if bulk_mode:
+                create_bulk_upload()
+            else:
+                uploaded_file = st.file_uploader("Upload", type=["jpg", "jpeg", "png"], label_visibility="collapsed")
+                if uploaded_file is not None:
+                    if st.button("Identify Breed", key="identify_button", use_container_width=True):
+                        image = Image.open(uploaded_file).convert("RGB")
+                        timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
+                        image_path = os.path.join(TEMP_DIR, f"dog_image_{timestamp}.jpg")
+                        image.save(image_path)
+                        process_image(image, image_path)
+        if bulk_mode and "bulk_job" in st.session_state:
+            show_bulk_job(st.session_state.bulk_job)
     
     chat_container = st.container()
     with chat_container:
         message_area = st.container()
         with message_area:
-            for message in st.session_state.messages:
+            store = st.session_state.session_store
+            hidden, visible_messages = store.window(st.session_state.render_window)
+            if store.evicted_count:
+                st.caption(f"{store.evicted_count} older messages were cleared to keep this session fast.")
+            if hidden:
+                if st.button(f"Show earlier messages ({hidden} hidden)", key="show_earlier_button"):
+                    st.session_state.render_window += MESSAGE_RENDER_WINDOW
+                    st.rerun()
+            for message in visible_messages:
                 with st.chat_message(message["role"]):
                     if "image" in message:
                         col1, col2, col3 = st.columns([1, 2, 1])
@@ -133,15 +149,58 @@ def create_chat_interface():
         if prompt := st.chat_input("Woof! Woof! Woof!"):
             process_chat_message(prompt)
 
+def create_bulk_upload():
+    uploaded_files = st.file_uploader("Upload", type=["jpg", "jpeg", "png"], accept_multiple_files=True,
+                                      label_visibility="collapsed", key="bulk_uploader")
+    job = st.session_state.get("bulk_job")
+    running = job is not None and not job.done
+    if uploaded_files:
+        if st.button(f"Identify {len(uploaded_files)} Breeds", key="bulk_identify_button",
+                     use_container_width=True, disabled=running):
+            start_bulk_job(uploaded_files)
+
+def start_bulk_job(uploaded_files):
+    predictor_tool = st.session_state.chatbot.predictor_agent.predictor_tool
+    files = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+    st.session_state.bulk_job = BulkJob(predictor_tool, files).start()
+    st.rerun()
+
+def show_bulk_job(job):
+    if job.done:
+        render_bulk_job(job)
+    else:
+        show_bulk_progress()
+
+@st.fragment(run_every=BULK_REFRESH_SECONDS)
+def show_bulk_progress():
+    # Only this fragment reruns while the job is in flight, the rest of the page stays interactive
+    job = st.session_state.bulk_job
+    if job.done:
+        st.rerun()
+    render_bulk_job(job)
+    if st.button("Cancel", key="bulk_cancel_button"):
+        job.cancel()
+
+def render_bulk_job(job):
+    progress = job.completed / job.total if job.total else 1.0
+    st.progress(progress, text=f"{job.completed}/{job.total} photos identified ({job.status})")
+    if job.status == "failed":
+        st.error(f"Bulk identification failed: {job.error}")
+    st.dataframe(job.results_frame(), use_container_width=True, hide_index=True)
+    if job.done and job.rows:
+        st.download_button("Download CSV", data=job.to_csv(), file_name=f"paw_detective_{job.id}.csv",
+                           mime="text/csv", key="bulk_download_button")
+
 def process_chat_message(prompt):
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    store = st.session_state.session_store
+    store.add_message("user", prompt)
     with st.spinner("Thinking..."):
         try:
             response = st.session_state.chatbot.process_message(prompt)
-            st.session_state.messages.append({"role": "assistant", "content": response})
+            store.add_message("assistant", response)
         except Exception as e:
             error_msg = f"Error: {str(e)}"
-            st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            store.add_message("assistant", error_msg)
     st.rerun()
 
 def main():
@@ -0,0 +1,51 @@
+import io
+from typing import Dict, Any, List, Optional, Tuple
+from PIL import Image
+from config import THUMBNAIL_MAX_SIZE, THUMBNAIL_QUALITY, MAX_SESSION_MESSAGES
+
+def make_thumbnail(image: Image.Image, max_size=THUMBNAIL_MAX_SIZE, quality=THUMBNAIL_QUALITY) -> bytes:
+    thumb = image.convert("RGB")
+    thumb.thumbnail(max_size)
+    buffer = io.BytesIO()
+    thumb.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+class SessionStore:
+    """Chat transcript for one Streamlit session.
+
+    Images are kept as downscaled JPEG bytes and the transcript is capped at
+    `max_messages`; the oldest messages are evicted and only counted.
+    """
+
+    def __init__(self, max_messages=MAX_SESSION_MESSAGES):
+        self.max_messages = max_messages
+        self.messages: List[Dict[str, Any]] = []
+        self.evicted_count = 0
+
+    def add_message(self, role: str, content: str, image: Optional[Image.Image] = None) -> None:
+        message = {"role": role, "content": content}
+        if image is not None:
+            message["image"] = make_thumbnail(image)
+        self.messages.append(message)
+        self._evict()
+
+    def _evict(self) -> None:
+        overflow = len(self.messages) - self.max_messages
+        if overflow > 0:
+            del self.messages[:overflow]
+            self.evicted_count += overflow
+
+    def window(self, size: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """Returns the number of hidden messages and the last `size` messages."""
+        hidden = max(len(self.messages) - size, 0)
+        return hidden, self.messages[hidden:]
+
+    def memory_bytes(self) -> int:
+        total = 0
+        for message in self.messages:
+            total += len(message["content"])
+            total += len(message.get("image", b""))
+        return total
+
+    def __len__(self) -> int:
+        return len(self.messages)
@@ -5,7 +5,42 @@ BASE_DIR = Path(__file__).resolve().parent
 MODELS_DIR = os.path.join(BASE_DIR, "Models")
 
 PAW_DETECTOR_MODEL = os.path.join(MODELS_DIR, "Paw Detector Final Model.keras")
+PAW_STUDENT_MODEL = os.path.join(MODELS_DIR, "Paw Detector Student Model.keras")
+# Class order the student was distilled onto, written next to it by student_cascade.py
+PAW_STUDENT_CLASS_INDICES = os.path.join(MODELS_DIR, "Paw Detector Student Model class_indices.json")
 LABELS_PATH = os.path.join(BASE_DIR, "labels.csv")
+BREED_ALIASES_PATH = os.path.join(BASE_DIR, "breed_aliases.json")
+
+# Versioned models: <MODEL_REGISTRY_DIR>/<version>/model.keras + class_indices.json,
+# optionally with a paired student.keras + student_class_indices.json
+MODEL_REGISTRY_DIR = os.path.join(MODELS_DIR, "registry")
+MODEL_REGISTRY_POLL_SECONDS = 30
+SHADOW_MODEL_VERSION = os.getenv("PAW_SHADOW_MODEL_VERSION")
+SHADOW_SAMPLE_RATE = 0.1
+SHADOW_MAX_PENDING = 8
 
 DEFAULT_MODEL_NAME = "llama3-70b-8192"
-DEFAULT_TEMPERATURE = 0.2
\ No newline at end of file
+DEFAULT_TEMPERATURE = 0.2
+
+# Cascade: the student answers unless its top-1 confidence is below the margin
+CASCADE_MARGIN = 0.8
+
+# Breed info prefetch after a prediction, shared by every session in the process
+PREFETCH_MAX_WORKERS = 4
+# Seconds a follow-up waits on its running prefetch before looking the breed up itself
+PREFETCH_WAIT_SECONDS = 30
+
+# Seconds a caller waits on an identical in-flight lookup or prediction
+COALESCE_TIMEOUT = 120
+
+# Bulk upload: images per forward pass and background jobs per process
+BULK_BATCH_SIZE = 32
+BULK_MAX_WORKERS = 1
+BULK_REFRESH_SECONDS = 1
+
+# Session state limits
+THUMBNAIL_MAX_SIZE = (400, 400)
+THUMBNAIL_QUALITY = 80
+MAX_SESSION_MESSAGES = 200
+MAX_CHAT_HISTORY = 50
+MESSAGE_RENDER_WINDOW = 20
@@ -0,0 +1,139 @@
+import difflib
+import json
+import re
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from config import BREED_ALIASES_PATH
+
+MAX_PHRASE_WORDS = 4
+FUZZY_MIN_LENGTH = 6
+FUZZY_CUTOFF = 0.88
+
+# Words that make an everyday-word alias ("golden", "boxer") mean the dog
+DOG_CONTEXT_WORDS = {"dog", "dogs", "breed", "breeds", "puppy", "puppies", "pup", "pups"}
+# ...or introduce it as the subject of a question ("tell me about the golden")
+INQUIRY_PREFIXES = {("about",), ("about", "the"), ("about", "a"), ("about", "an")}
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+class BreedIndex:
+    """Resolves model labels, breed names and synonyms to one canonical breed.
+
+    Built from breed_aliases.json, which lists every labels.csv breed with its
+    display name, synonyms and per-source URL slug (null when the source has
+    no page for the breed). Synonyms shared by several breeds ("poodle") form
+    a family, resolved to the preferred breed when one is given. Synonyms in
+    `context_aliases` are nicknames that are also everyday words ("golden",
+    "lab"); in free text they only count next to a word like "dog" or
+    "breed", or right after "about (the)".
+    """
+
+    def __init__(self, aliases_path=BREED_ALIASES_PATH):
+        with open(aliases_path) as f:
+            self.breeds: Dict[str, Dict[str, Any]] = json.load(f)
+
+        self.families: Dict[str, List[str]] = {}
+        self.context_aliases = set()
+        for label, entry in self.breeds.items():
+            for alias in [label, entry["name"], *entry["aliases"]]:
+                family = self.families.setdefault(normalize(alias), [])
+                if label not in family:
+                    family.append(label)
+            self.context_aliases.update(normalize(alias) for alias in entry.get("context_aliases", []))
+        self.aliases: Dict[str, str] = {alias: family[0] for alias, family in self.families.items()}
+        self.families = {alias: family for alias, family in self.families.items() if len(family) > 1}
+
+        # Fuzzy candidates bucketed by first letter keep difflib's search small
+        self._fuzzy_buckets: Dict[str, List[str]] = {}
+        for alias in self.aliases:
+            if len(alias) >= FUZZY_MIN_LENGTH and alias not in self.context_aliases:
+                self._fuzzy_buckets.setdefault(alias[0], []).append(alias)
+
+    def resolve(self, name: str, preferred: Sequence[str] = ()) -> Optional[str]:
+        """Returns the labels.csv breed for a name or synonym, or None."""
+        key = normalize(name)
+        if not key:
+            return None
+        if key in self.aliases:
+            return self._pick(key, preferred)
+        if alias := self._fuzzy_lookup(key):
+            return self._pick(alias, preferred)
+        return None
+
+    def find_in_text(self, text: str, preferred: Sequence[str] = ()) -> Optional[str]:
+        """Returns the first breed mentioned in free text, preferring longer phrases.
+
+        A family name such as "poodle" resolves to the first of `preferred`
+        (e.g. the predicted breed and its alternatives) in that family.
+        """
+        match = self._find_mention(normalize(text).split(), preferred)
+        return match[2] if match else None
+
+    def canonical_text(self, text: str, preferred: Sequence[str] = ()) -> str:
+        """Returns the normalized text with the breed mention replaced by its label.
+
+        "History of the Golden Retriever?" and "history of the golden_retriever"
+        both become "history of the golden_retriever", so they can share a key.
+        """
+        words = normalize(text).split()
+        match = self._find_mention(words, preferred)
+        if match:
+            i, size, label = match
+            words[i:i + size] = [label]
+        return " ".join(words)
+
+    def _find_mention(self, words: List[str], preferred: Sequence[str]) -> Optional[Tuple[int, int, str]]:
+        """Returns (start, length, label) of the first breed mentioned in `words`."""
+        for size in range(min(MAX_PHRASE_WORDS, len(words)), 0, -1):
+            for i in range(len(words) - size + 1):
+                phrase = " ".join(words[i:i + size])
+                if phrase in self.aliases and self._in_context(phrase, words, i, size):
+                    return i, size, self._pick(phrase, preferred)
+        for size in range(min(MAX_PHRASE_WORDS, len(words)), 0, -1):
+            for i in range(len(words) - size + 1):
+                if alias := self._fuzzy_lookup(" ".join(words[i:i + size])):
+                    return i, size, self._pick(alias, preferred)
+        return None
+
+    def _in_context(self, phrase: str, words: List[str], i: int, size: int) -> bool:
+        if phrase not in self.context_aliases:
+            return True
+        if tuple(words[max(i - 1, 0):i]) in INQUIRY_PREFIXES or tuple(words[max(i - 2, 0):i]) in INQUIRY_PREFIXES:
+            return True
+        neighbours = words[max(i - 1, 0):i] + words[i + size:i + size + 1]
+        return any(word in DOG_CONTEXT_WORDS for word in neighbours)
+
+    def _pick(self, alias: str, preferred: Sequence[str]) -> str:
+        family = self.families.get(alias)
+        if family:
+            for label in preferred:
+                if label in family:
+                    return label
+        return self.aliases[alias]
+
+    def _fuzzy_lookup(self, key: str) -> Optional[str]:
+        """Returns the alias closest to `key`, or None."""
+        if len(key) < FUZZY_MIN_LENGTH:
+            return None
+        candidates = self._fuzzy_buckets.get(key[0], [])
+        matches = difflib.get_close_matches(key, candidates, n=1, cutoff=FUZZY_CUTOFF)
+        return matches[0] if matches else None
+
+    def display_name(self, label: str) -> str:
+        entry = self.breeds.get(label)
+        return entry["name"] if entry else label
+
+    def source_slug(self, label: str, source: str) -> Optional[str]:
+        """Returns the URL slug of a breed on a source, None if the source has no page."""
+        return self.breeds[label]["slugs"].get(source)
+
+_breed_index = None
+_breed_index_lock = threading.Lock()
+
+def get_breed_index() -> BreedIndex:
+    global _breed_index
+    with _breed_index_lock:
+        if _breed_index is None:
+            _breed_index = BreedIndex()
+        return _breed_index
@@ -0,0 +1,245 @@
+import io
+import json
+import logging
+import os
+import random
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+import numpy as np
+import tensorflow as tf
+from tools.paw_predictor_tool import StudentModel, model_input_spec, load_image
+from config import (MODEL_REGISTRY_DIR, MODEL_REGISTRY_POLL_SECONDS, SHADOW_MODEL_VERSION,
+                    SHADOW_SAMPLE_RATE, SHADOW_MAX_PENDING)
+
+MODEL_FILENAME = "model.keras"
+CLASS_INDICES_FILENAME = "class_indices.json"
+STUDENT_FILENAME = "student.keras"
+STUDENT_CLASS_INDICES_FILENAME = "student_class_indices.json"
+ACTIVE_FILENAME = "ACTIVE"
+STAGING_DIRNAME = ".staging"
+
+logger = logging.getLogger(__name__)
+
+class ModelVersion:
+    def __init__(self, version: str, version_dir: str):
+        self.version = version
+        self.model = tf.keras.models.load_model(os.path.join(version_dir, MODEL_FILENAME))
+        with open(os.path.join(version_dir, CLASS_INDICES_FILENAME)) as f:
+            self.class_indices = json.load(f)
+        self.inv_class_indices = {v: k for k, v in self.class_indices.items()}
+        self.img_size, self.uint8_input = model_input_spec(self.model)
+        # A version without its own student serves every request from the full model
+        self.student: Optional[StudentModel] = None
+        if os.path.exists(os.path.join(version_dir, STUDENT_FILENAME)):
+            self.student = StudentModel(os.path.join(version_dir, STUDENT_FILENAME),
+                                        os.path.join(version_dir, STUDENT_CLASS_INDICES_FILENAME))
+
+    def warm_up(self) -> None:
+        # The first call traces the graph; pay for it before taking traffic
+        models = [(self.model, self.img_size, self.uint8_input)]
+        if self.student is not None:
+            models.append((self.student.model, self.student.img_size, self.student.uint8_input))
+        for model, img_size, uint8_input in models:
+            dtype = np.uint8 if uint8_input else np.float32
+            model.predict(np.zeros((1, *img_size, 3), dtype=dtype), verbose=0)
+
+class ShadowStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.agreements = 0
+        self.errors = 0
+        self.latency = 0.0
+
+    def record(self, agreed: bool, seconds: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.agreements += agreed
+            self.latency += seconds
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "agreement": self.agreements / self.requests if self.requests else 0.0,
+                "avg_latency": self.latency / self.requests if self.requests else 0.0,
+                "errors": self.errors
+            }
+
+class ModelRegistry:
+    """Versioned model artifacts with hot swap and optional shadow evaluation.
+
+    The active version is named in the registry's ACTIVE file. Without one, a
+    new process starts on the newest version, but running processes only swap
+    on `activate`, never on `publish`. `activate` loads and warms a version
+    before swapping it in, so requests always see a complete model.
+    """
+
+    def __init__(self, registry_dir=MODEL_REGISTRY_DIR):
+        self.registry_dir = registry_dir
+        self._lock = threading.Lock()
+        self._active: Optional[ModelVersion] = None
+        self._shadow: Optional[ModelVersion] = None
+        self.shadow_sample_rate = SHADOW_SAMPLE_RATE
+        self.shadow_stats = ShadowStats()
+        self._shadow_pending = 0
+        self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="paw-shadow")
+        self._watcher = None
+
+        versions = self.list_versions()
+        if version := self._read_active_version() or (versions[-1] if versions else None):
+            self.activate(version, persist=False)
+
+    @property
+    def active(self) -> Optional[ModelVersion]:
+        return self._active
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.registry_dir):
+            return []
+        # Hidden entries are publishes in progress; natural order puts v10 after v9
+        return sorted(
+            (name for name in os.listdir(self.registry_dir)
+             if not name.startswith(".") and os.path.exists(os.path.join(self.registry_dir, name, MODEL_FILENAME))),
+            key=lambda name: [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+        )
+
+    def publish(self, version: str, model_path: str, class_indices: Dict[str, int],
+                student_path: Optional[str] = None, student_class_indices: Optional[Dict[str, int]] = None) -> str:
+        """Adds a version; a student distilled from this model may ship with it for the cascade."""
+        version_dir = os.path.join(self.registry_dir, version)
+        if os.path.exists(version_dir):
+            raise ValueError(f"Model version {version} already exists in {self.registry_dir}")
+        staging_dir = os.path.join(self.registry_dir, STAGING_DIRNAME, version)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+        try:
+            shutil.copy(model_path, os.path.join(staging_dir, MODEL_FILENAME))
+            with open(os.path.join(staging_dir, CLASS_INDICES_FILENAME), "w") as f:
+                json.dump(class_indices, f, indent=2)
+            if student_path:
+                shutil.copy(student_path, os.path.join(staging_dir, STUDENT_FILENAME))
+                with open(os.path.join(staging_dir, STUDENT_CLASS_INDICES_FILENAME), "w") as f:
+                    json.dump(student_class_indices or class_indices, f, indent=2)
+            os.replace(staging_dir, version_dir)
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        return version_dir
+
+    def load(self, version: str) -> ModelVersion:
+        version_dir = os.path.join(self.registry_dir, version)
+        if not os.path.exists(os.path.join(version_dir, MODEL_FILENAME)):
+            raise FileNotFoundError(f"Model version {version} not found in {self.registry_dir}")
+        model_version = ModelVersion(version, version_dir)
+        model_version.warm_up()
+        return model_version
+
+    def activate(self, version: str, persist=True) -> ModelVersion:
+        model_version = self.load(version)
+        with self._lock:
+            self._active = model_version
+        if persist:
+            self._write_active_version(version)
+        return model_version
+
+    def set_shadow(self, version: Optional[str], sample_rate=None) -> None:
+        model_version = self.load(version) if version else None
+        with self._lock:
+            self._shadow = model_version
+            self.shadow_stats = ShadowStats()
+            if sample_rate is not None:
+                self.shadow_sample_rate = sample_rate
+
+    def shadow(self, img_path: str, active_breed: str) -> None:
+        """Runs the shadow candidate on a sampled request in the background."""
+        candidate = self._shadow
+        if candidate is None or random.random() >= self.shadow_sample_rate:
+            return
+        with self._lock:
+            if self._shadow_pending >= SHADOW_MAX_PENDING:
+                return
+            self._shadow_pending += 1
+        try:
+            # Read the upload now; callers such as bulk jobs delete it once they have their answer
+            with open(img_path, "rb") as f:
+                img_bytes = f.read()
+        except OSError:
+            with self._lock:
+                self._shadow_pending -= 1
+            self.shadow_stats.record_error()
+            return
+        self._shadow_executor.submit(self._run_shadow, candidate, self.shadow_stats, img_bytes, active_breed)
+
+    def _run_shadow(self, candidate: ModelVersion, stats: ShadowStats, img_bytes: bytes, active_breed: str) -> None:
+        try:
+            start = time.perf_counter()
+            # The candidate may differ in input size or contract, so it decodes its own input
+            img_array = load_image(io.BytesIO(img_bytes), candidate.img_size, candidate.uint8_input)
+            preds = candidate.model.predict(img_array, verbose=0)[0]
+            shadow_breed = candidate.inv_class_indices[int(np.argmax(preds))]
+            stats.record(shadow_breed == active_breed, time.perf_counter() - start)
+        except Exception:
+            stats.record_error()
+        finally:
+            with self._lock:
+                self._shadow_pending -= 1
+
+    def refresh(self) -> bool:
+        """Activates the version named in the ACTIVE file if it changed."""
+        version = self._read_active_version()
+        current = self._active.version if self._active else None
+        if version and version != current:
+            self.activate(version, persist=False)
+            return True
+        return False
+
+    def start_watching(self, interval=MODEL_REGISTRY_POLL_SECONDS) -> None:
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.exception("Model registry refresh failed: %s", e)
+
+        self._watcher = threading.Thread(target=watch, name="paw-registry-watcher", daemon=True)
+        self._watcher.start()
+
+    def _read_active_version(self) -> Optional[str]:
+        active_path = os.path.join(self.registry_dir, ACTIVE_FILENAME)
+        if os.path.exists(active_path):
+            with open(active_path) as f:
+                return f.read().strip() or None
+        return None
+
+    def _write_active_version(self, version: str) -> None:
+        active_path = os.path.join(self.registry_dir, ACTIVE_FILENAME)
+        tmp_path = f"{active_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(version)
+        os.replace(tmp_path, active_path)
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> ModelRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+            if SHADOW_MODEL_VERSION:
+                _registry.set_shadow(SHADOW_MODEL_VERSION)
+            _registry.start_watching()
+        return _registry
@@ -3,51 +3,247 @@ import tensorflow as tf
 from tensorflow.keras.preprocessing import image
 from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
 import pandas as pd
+import hashlib
+import json
 import os
+import threading
+import time
+from tools.single_flight import SingleFlight
+from config import CASCADE_MARGIN, BULK_BATCH_SIZE
 
-class PawPredictorTool:
-    def __init__(self, model_path, labels_path):
-        # Load model and labels
+DEFAULT_IMG_SIZE = (224, 224)
+
+_predict_flight = SingleFlight()
+
+_student_models = {}
+_student_models_lock = threading.Lock()
+
+def model_input_spec(model, default_size=DEFAULT_IMG_SIZE):
+    """Returns the (height, width) to resize to and whether the model takes raw uint8 pixels.
+
+    Models exported by Scripts/export_uint8_model.py accept any spatial size, so
+    the host resizes straight to the size of their `resize` layer; the layer is
+    then an identity and each image is resampled once.
+    """
+    height, width = model.input_shape[1:3]
+    if not (height and width):
+        try:
+            resize = model.get_layer("resize")
+            height, width = resize.height, resize.width
+        except ValueError:
+            pass
+    img_size = (height, width) if height and width else default_size
+    return img_size, tf.as_dtype(model.inputs[0].dtype) == tf.uint8
+
+def load_image(img_path, target_size, uint8_input=False):
+    img = image.load_img(img_path, target_size=target_size)
+    if uint8_input:
+        return np.expand_dims(np.asarray(img, dtype=np.uint8), axis=0)
+    return preprocess_input(np.expand_dims(image.img_to_array(img), axis=0))
+
+class StudentModel:
+    """Small model distilled from one teacher, with the class order it was trained on."""
+
+    def __init__(self, model_path, class_indices_path):
         self.model = tf.keras.models.load_model(model_path)
+        with open(class_indices_path) as f:
+            self.class_indices = json.load(f)
+        self.inv_class_indices = {v: k for k, v in self.class_indices.items()}
+        self.img_size, self.uint8_input = model_input_spec(self.model)
+
+def get_student_model(model_path, class_indices_path):
+    """Returns the student loaded once per process, or None if either file is missing."""
+    if not (os.path.exists(model_path) and os.path.exists(class_indices_path)):
+        return None
+    with _student_models_lock:
+        if model_path not in _student_models:
+            _student_models[model_path] = StudentModel(model_path, class_indices_path)
+        return _student_models[model_path]
+
+class CascadeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.served = {"student": 0, "full": 0}
+        self.latency = {"student": 0.0, "full": 0.0}
+
+    def record(self, stage, seconds, count=1):
+        with self._lock:
+            self.served[stage] += count
+            self.latency[stage] += seconds
+
+    def summary(self):
+        with self._lock:
+            total = sum(self.served.values())
+            return {
+                "requests": total,
+                "student_share": self.served["student"] / total if total else 0.0,
+                "full_share": self.served["full"] / total if total else 0.0,
+                "avg_latency": sum(self.latency.values()) / total if total else 0.0
+            }
+
+class PawPredictorTool:
+    def __init__(self, model_path, labels_path, student_model_path=None, cascade_margin=None,
+                 registry=None, student_class_indices_path=None):
+        # Each request serves the registry's active version when there is one, the model file otherwise
+        self.registry = registry
+        self.model_path = model_path
+        self.model = None
+        self._model_lock = threading.Lock()
+        if registry is None:
+            self._file_model()
         if not os.path.exists(labels_path):
             raise FileNotFoundError(f"Labels file not found at {labels_path}")
-            
+
         self.labels = pd.read_csv(labels_path)
         self._create_class_mapping()
-        self.IMG_SIZE = (224, 224)
-    
+
+        # Optional small student that answers confident requests on its own. It pairs with the
+        # model file; registry versions carry their own student, or serve without a cascade.
+        self.student = None
+        self.student_model_path = student_model_path
+        if student_model_path and student_class_indices_path:
+            self.student = get_student_model(student_model_path, student_class_indices_path)
+        self.cascade_margin = cascade_margin if cascade_margin is not None else CASCADE_MARGIN
+        self.cascade_stats = CascadeStats()
+
     def _create_class_mapping(self):
         unique_breeds = self.labels['breed'].unique()
         self.class_indices = {breed: i for i, breed in enumerate(sorted(unique_breeds))}
         self.inv_class_indices = {v: k for k, v in self.class_indices.items()}
-    
+
+    def _file_model(self):
+        # Loaded on first use when a registry is attached, which may never need it
+        with self._model_lock:
+            if self.model is None:
+                self.model = tf.keras.models.load_model(self.model_path)
+                self.IMG_SIZE, self.uint8_input = model_input_spec(self.model)
+            return self.model
+
+    def _load_batch(self, img_paths, indices, target_size, uint8_input, outputs):
+        """Decodes images one by one, so an unreadable file only fails itself.
+
+        Its error goes to `outputs`; returns the batch of the rest and their indices.
+        """
+        arrays, loaded = [], []
+        for i in indices:
+            try:
+                arrays.append(load_image(img_paths[i], target_size, uint8_input))
+                loaded.append(i)
+            except Exception as e:
+                outputs[i] = e
+        return (np.concatenate(arrays) if arrays else None), loaded
+
+    def _cascade_predict(self, img_paths):
+        """Returns (predictions, class mapping) per image, from the model that produced them.
+
+        Images that could not be decoded get their exception instead.
+        """
+        # Read the active version once so a hot swap can't mix two models in one request
+        active = self.registry.active if self.registry else None
+        outputs = self._run_cascade(img_paths, active)
+        if self.registry is not None:
+            # Shadow sampling covers every answered image, whichever stage answered it
+            for img_path, output in zip(img_paths, outputs):
+                if not isinstance(output, Exception):
+                    preds, inv_class_indices = output
+                    self.registry.shadow(img_path, inv_class_indices[int(np.argmax(preds))])
+        return outputs
+
+    def _run_cascade(self, img_paths, active):
+        outputs = [None] * len(img_paths)
+        pending = list(range(len(img_paths)))
+        start = time.perf_counter()
+        student = active.student if active is not None else self.student
+        if student is not None:
+            img_array, pending = self._load_batch(img_paths, pending, student.img_size, student.uint8_input, outputs)
+            if pending:
+                preds = student.model.predict(img_array, batch_size=len(pending), verbose=0)
+                for i, row in zip(pending, preds):
+                    if row.max() >= self.cascade_margin:
+                        outputs[i] = (row, student.inv_class_indices)
+                readable = len(pending)
+                pending = [i for i in pending if outputs[i] is None]
+                served = readable - len(pending)
+                if served:
+                    self.cascade_stats.record("student", (time.perf_counter() - start) * served / readable, served)
+        if not pending:
+            return outputs
+
+        if active is not None:
+            model, inv_class_indices = active.model, active.inv_class_indices
+            img_array, pending = self._load_batch(img_paths, pending, active.img_size, active.uint8_input, outputs)
+        else:
+            model, inv_class_indices = self._file_model(), self.inv_class_indices
+            img_array, pending = self._load_batch(img_paths, pending, self.IMG_SIZE, self.uint8_input, outputs)
+        if not pending:
+            return outputs
+
+        preds = model.predict(img_array, batch_size=len(pending), verbose=0)
+        for i, row in zip(pending, preds):
+            outputs[i] = (row, inv_class_indices)
+        self.cascade_stats.record("full", time.perf_counter() - start, len(pending))
+        return outputs
+
+    def _model_key(self):
+        # Tools serving the same models give the same answer, whatever session owns them
+        active = self.registry.active if self.registry else None
+        if active is not None:
+            return f"registry:{active.version}|{self.cascade_margin}"
+        student = self.student_model_path if self.student is not None else None
+        return f"{self.model_path}|{student}|{self.cascade_margin}"
+
     def predict_breed(self, img_path, confidence_threshold=0.7):
         try:
-            # Preprocess image
-            img = image.load_img(img_path, target_size=self.IMG_SIZE)
-            img_array = preprocess_input(np.expand_dims(image.img_to_array(img), axis=0))
-            
-            # Get predictions
-            preds = self.model.predict(img_array)[0]
-            top_indices = np.argsort(preds)[-3:][::-1]  # Top 3 predictions
-            
-            # Format results
-            top_breed = self.inv_class_indices[top_indices[0]]
-            top_confidence = float(preds[top_indices[0]])
-            is_reliable = top_confidence >= confidence_threshold
-            
-            # Get alternatives if confidence is low
-            alternatives = [
-                {"breed": self.inv_class_indices[i], "confidence": float(preds[i])}
-                for i in top_indices[1:] if preds[i] > 0.2
-            ]
-            
-            return {
-                "breed": top_breed,
-                "confidence": top_confidence,
-                "is_reliable": is_reliable,
-                "alternatives": alternatives
-            }
-            
+            with open(img_path, "rb") as f:
+                key = f"{self._model_key()}|{hashlib.sha256(f.read()).hexdigest()}|{confidence_threshold}"
+            return _predict_flight.do(key, self._predict_breed, img_path, confidence_threshold)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def predict_batch(self, img_paths, confidence_threshold=0.7, batch_size=BULK_BATCH_SIZE):
+        """Headless batch path: one forward pass per chunk of `batch_size` images."""
+        results = []
+        for start in range(0, len(img_paths), batch_size):
+            chunk = img_paths[start:start + batch_size]
+            try:
+                outputs = self._cascade_predict(chunk)
+            except Exception as e:
+                outputs = [e] * len(chunk)
+            # Unreadable images come back as their error; the rest still shared one forward pass
+            results.extend(
+                {"error": str(output)} if isinstance(output, Exception)
+                else self._format_prediction(*output, confidence_threshold)
+                for output in outputs
+            )
+        return results
+
+    def _predict_breed(self, img_path, confidence_threshold):
+        try:
+            output = self._cascade_predict([img_path])[0]
+            if isinstance(output, Exception):
+                raise output
+            preds, inv_class_indices = output
+            return self._format_prediction(preds, inv_class_indices, confidence_threshold)
         except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+
+    def _format_prediction(self, preds, inv_class_indices, confidence_threshold):
+        top_indices = np.argsort(preds)[-3:][::-1]  # Top 3 predictions
+
+        # Format results
+        top_breed = inv_class_indices[top_indices[0]]
+        top_confidence = float(preds[top_indices[0]])
+        is_reliable = top_confidence >= confidence_threshold
+
+        # Get alternatives if confidence is low
+        alternatives = [
+            {"breed": inv_class_indices[i], "confidence": float(preds[i])}
+            for i in top_indices[1:] if preds[i] > 0.2
+        ]
+
+        return {
+            "breed": top_breed,
+            "confidence": top_confidence,
+            "is_reliable": is_reliable,
+            "alternatives": alternatives
+        }
@@ -2,6 +2,11 @@ import requests
 from bs4 import BeautifulSoup
 import time
 from typing import Dict, Any
+from concurrent.futures import TimeoutError
+from tools.breed_index import get_breed_index
+from tools.single_flight import SingleFlight
+
+_scrape_flight = SingleFlight()
 
 class PawRetrieverTool:
     def __init__(self):
@@ -12,9 +17,33 @@ class PawRetrieverTool:
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
+        self.breed_index = get_breed_index()
     
+    def _source_slugs(self, breed: str) -> Dict[str, Any]:
+        label = self.breed_index.resolve(breed)
+        if label is None:
+            formatted_breed = breed.lower().replace(" ", "-").replace("_", "-")
+            return {source_name: formatted_breed for source_name in self.sources}
+        return {source_name: self.breed_index.source_slug(label, source_name) for source_name in self.sources}
+
     def scrape_breed_info(self, breed: str) -> Dict[str, Any]:
-        formatted_breed = breed.lower().replace(" ", "-")
+        source_slugs = self._source_slugs(breed)
+        if not any(source_slugs.values()):
+            return {
+                "breed": breed,
+                "content": {},
+                "success": False,
+                "error": f"None of the curated sources cover {breed}"
+            }
+
+        key = "|".join(f"{self.sources[source_name]}{slug}" for source_name, slug in source_slugs.items() if slug)
+        try:
+            results = _scrape_flight.do(key, self._scrape, breed, source_slugs)
+        except TimeoutError as e:
+            return {"breed": breed, "content": {}, "success": False, "error": str(e)}
+        return dict(results, breed=breed)
+
+    def _scrape(self, breed: str, source_slugs: Dict[str, Any]) -> Dict[str, Any]:
         results = {
             "breed": breed,
             "content": {},
@@ -22,9 +51,12 @@ class PawRetrieverTool:
             "error": None
         }
 
-        for source_name, base_url in self.sources.items():
+        for source_name, slug in source_slugs.items():
+            # Known to have no page for this breed, don't spend a request on it
+            if slug is None:
+                continue
             try:
-                url = f"{base_url}{formatted_breed}"
+                url = f"{self.sources[source_name]}{slug}"
                 response = requests.get(url, headers=self.headers, timeout=10)
                 time.sleep(1)
                 
@@ -0,0 +1,48 @@
+import threading
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Callable, Dict
+from config import COALESCE_TIMEOUT
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one computation.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for its result, or re-raise its exception, instead of
+    repeating the work. Nothing is cached once the call completes.
+
+    Keep one instance per kind of call at module level: it is then shared by
+    every session in the process, which is where identical calls come from.
+    """
+
+    def __init__(self, timeout=COALESCE_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                call.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+            return call.result()
+
+        try:
+            return call.result(timeout=self.timeout)
+        except TimeoutError:
+            raise TimeoutError(f"Timed out after {self.timeout}s waiting for in-flight request {key}")